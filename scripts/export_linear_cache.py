@@ -7,11 +7,16 @@ with recent issue titles. Outputs JSON to stdout, errors to stderr.
 """
 from __future__ import annotations
 
+import contextlib
+import heapq
+import itertools
 import json
 import os
+import pickle
 import sys
+import tempfile
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable, Iterator, Optional
 
 # Setup vendor paths (local to this script)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -24,6 +29,24 @@ LINEAR_DB_PATH = os.path.expanduser(
 LINEAR_BLOB_PATH = os.path.expanduser(
     "~/Library/Application Support/Linear/IndexedDB/https_linear.app_0.indexeddb.blob"
 )
+TABLE_CACHE_PATH = os.path.expanduser("~/Library/Caches/linear-capture/linear_table_cache.pickle")
+TABLE_CACHE_VERSION = 3
+
+# Fields kept for each cached record: everything the record type checks and export_all() read.
+PROJECTED_FIELDS = frozenset({
+    "id", "name", "key", "title", "number", "type", "color", "email", "description",
+    "teamId", "teamIds", "projectId", "stateId", "statusId", "organizationId", "parentId", "state",
+    "startsAt", "endsAt", "updatedAt", "isGroup", "avatarUrl", "displayName",
+    "issueEstimationType", "issueEstimationAllowZero", "issueEstimationExtended",
+})
+
+# Recent issue titles exported per project, and the issue fields EntityIndex groups by by default.
+RECENT_ISSUES_LIMIT = 10
+ISSUE_GROUP_FIELDS = ("projectId", "teamId", "stateId")
+INACTIVE_STATE_TYPES = frozenset({"completed", "canceled"})
+
+# Set (to anything but "" or "0") to instrument exports, as --instrument does.
+INSTRUMENT_ENV_VAR = "LINEAR_CAPTURE_INSTRUMENT"
 
 
 def setup_pythonpath() -> None:
@@ -33,6 +56,38 @@ def setup_pythonpath() -> None:
             sys.path.insert(0, path)
 
 
+def make_instrumentation() -> Any:
+    """
+    Create a ccl_chromium_reader Instrumentation which reports each phase to stderr as it finishes.
+
+    Each report is one JSON line: {"instrumentation": "phase", "name", "wall_seconds", "cpu_seconds"},
+    so the slow phase shows up even when the caller gives up on the export before it completes.
+    """
+    setup_pythonpath()
+    from ccl_chromium_reader.common import Instrumentation  # type: ignore
+
+    def report(name: str, wall: float, cpu: float) -> None:
+        line = {
+            "instrumentation": "phase",
+            "name": name,
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(cpu, 6),
+        }
+        print(json.dumps(line), file=sys.stderr, flush=True)
+
+    return Instrumentation(on_phase=report)
+
+
+def instrumentation_enabled() -> bool:
+    """Whether INSTRUMENT_ENV_VAR asks for instrumentation."""
+    return os.environ.get(INSTRUMENT_ENV_VAR, "") not in ("", "0")
+
+
+def _phase(instrumentation: Any, name: str) -> Any:
+    """instrumentation.phase(name), or a no-op context when instrumentation is None."""
+    return instrumentation.phase(name) if instrumentation is not None else contextlib.nullcontext()
+
+
 def is_project_record(record: dict[str, Any]) -> bool:
     """Check if a record looks like a Linear project."""
     required = {"name", "teamIds", "statusId", "organizationId"}
@@ -85,109 +140,487 @@ def is_label_record(record: dict[str, Any]) -> bool:
     return isinstance(color, str) and color.startswith("#") and len(color) <= 10
 
 
-def load_linear_data() -> tuple[dict, dict, dict, dict, dict, dict, dict]:
+ENTITY_TYPES = ("projects", "teams", "issues", "states", "users", "cycles", "labels")
+# The entity lists of the version 3 export, in payload order.
+EXPORT_SECTIONS = ("teams", "projects", "users", "states", "cycles", "labels", "issues")
+
+
+def classify_record(record: dict[str, Any]) -> Optional[str]:
+    """Return the Linear entity type of a record (as named in load_linear_data's result), or None."""
+    if is_project_record(record):
+        return "projects"
+    if is_team_record(record):
+        return "teams"
+    if is_issue_record(record):
+        return "issues"
+    if is_workflow_state_record(record):
+        return "states"
+    if is_user_record(record):
+        return "users"
+    if is_cycle_record(record):
+        return "cycles"
+    if is_label_record(record):
+        return "labels"
+    return None
+
+
+def _to_builtin(value: Any) -> Any:
+    """Reduce a decoded value to plain builtins so it can be stored in the table cache."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {k: _to_builtin(v) for k, v in value.items() if isinstance(k, (str, int))}
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    return None
+
+
+def project_record(value: Any) -> Any:
     """
-    Load projects, teams, issues, states, users, cycles, and labels from Linear IndexedDB.
+    Reduce a decoded record value to the fields the exporter uses.
 
-    Returns: (projects, teams, issues, states, users, cycles, labels)
+    Non-object values become False: only their type matters (they stop a store from being classified).
     """
-    setup_pythonpath()
-    try:
-        from ccl_chromium_reader import ccl_chromium_indexeddb  # type: ignore
-    except ImportError as e:
-        print(f"Error: Failed to import ccl_chromium_reader: {e}", file=sys.stderr)
-        sys.exit(1)
+    if value is None:
+        return None
+    if not isinstance(value, dict):
+        return False
+    return {k: _to_builtin(v) for k, v in value.items() if k in PROJECTED_FIELDS}
 
-    _empty = {}, {}, {}, {}, {}, {}, {}
 
-    if not os.path.exists(LINEAR_DB_PATH):
-        return _empty
+class _TableCacheUnpickler(pickle.Unpickler):
+    """Unpickler for the table cache, which only ever holds builtins."""
 
-    try:
-        wrapper = ccl_chromium_indexeddb.WrappedIndexDB(LINEAR_DB_PATH, LINEAR_BLOB_PATH)
-    except Exception as e:
-        print(f"Error: Failed to open IndexedDB: {e}", file=sys.stderr)
-        return _empty
+    def find_class(self, module: str, name: str) -> Any:
+        raise pickle.UnpicklingError(f"Unexpected global in table cache: {module}.{name}")
 
-    db = None
+
+def load_table_cache(path: str) -> dict[str, Any]:
+    """
+    Load the per-table record cache written by save_table_cache.
+
+    The cache maps table file names to {"size", "mtime_ns", "stores"} where stores maps
+    (db_id, store_id) to {"versions", "values"} for that store: versions lists the table's
+    (user_key, seq, is_live) and values maps the seq of each version decoded so far (the newest
+    of its key when it was read) to its projected value. The cache also maps the stores which
+    have been classified to their entity type, or None for those which aren't Linear entity stores
+    (see _start_linear_entities), in "store_types".
+    A missing, unreadable or out of date cache is replaced by an empty one.
+    """
+    empty = {"version": TABLE_CACHE_VERSION, "db_path": LINEAR_DB_PATH, "tables": {}, "store_types": {}}
     try:
-        for db_id in wrapper.database_ids:
-            if "linear_" in db_id.name and db_id.name != "linear_databases":
-                candidate = wrapper[db_id.name, db_id.origin]
-                if list(candidate.object_store_names):
-                    db = candidate
-                    break
+        with open(path, "rb") as f:
+            cache = _TableCacheUnpickler(f).load()
+    except Exception:
+        return empty
+    if (
+        not isinstance(cache, dict)
+        or cache.get("version") != TABLE_CACHE_VERSION
+        or cache.get("db_path") != LINEAR_DB_PATH
+        or not isinstance(cache.get("tables"), dict)
+        or not isinstance(cache.get("store_types"), dict)
+    ):
+        return empty
+    return cache
+
+
+def save_table_cache(path: str, cache: dict[str, Any]) -> None:
+    """Atomically write the per-table record cache. Failures are reported but not fatal."""
+    try:
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".linear_table_cache.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
     except Exception as e:
-        print(f"Error: Failed to find Linear database: {e}", file=sys.stderr)
-        return _empty
+        print(f"Warning: Failed to write table cache: {e}", file=sys.stderr)
 
-    if not db:
-        return _empty
 
-    projects: dict[str, dict] = {}
-    teams: dict[str, dict] = {}
-    issues: dict[str, dict] = {}
-    states: dict[str, dict] = {}
-    users: dict[str, dict] = {}
-    cycles: dict[str, dict] = {}
-    labels: dict[str, dict] = {}
+def _read_store_values(
+    store: Any, db_id: int, files: tuple, table_cache: Optional[dict[str, Any]], instrumentation: Any = None
+) -> Callable[[], list[Any]]:
+    """
+    Start reading the live values of a store's records in key order, projected for caching.
+
+    Versions are resolved on their keys before any value is decoded: every version's
+    (user_key, seq, is_live) is listed file by file, the newest version of each key wins, and only
+    the winners which are live are decoded. Table (.ldb) files are immutable, so their versions,
+    and the values decoded from them, are taken from table_cache when the file's size and mtime
+    still match, and added to it otherwise. Log files are always read. Returns a function which
+    finishes reading: with jobs > 1 the winners are decoded by the worker processes from when this
+    is called, so the stores of a database are decoded concurrently.
+    """
+    from ccl_chromium_reader.storage_formats import ccl_leveldb  # type: ignore
+
+    live_state = ccl_leveldb.KeyState.Live
+    store_key = (db_id, store.object_store_id)
+    # user_key -> (seq, is_live, table cache entry, raw record, file); no raw record for cached versions
+    newest: dict[bytes, tuple[int, bool, Optional[dict[str, Any]], Any, Any]] = {}
+    for file in files:
+        table = None
+        if table_cache is not None and file.path.suffix != ".log":
+            stat = file.path.stat()
+            table = table_cache.get(file.path.name)
+            if table is None or table["size"] != stat.st_size or table["mtime_ns"] != stat.st_mtime_ns:
+                table = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "stores": {}}
+                table_cache[file.path.name] = table
+
+        entry = table["stores"].get(store_key) if table is not None else None
+        if table is not None and instrumentation is not None:
+            instrumentation.count("table_cache_misses" if entry is None else "table_cache_hits")
+        if entry is None:
+            versions = [
+                (record.user_key, record.seq, record.state == live_state, record)
+                for record in store.iterate_raw_records_in_files([file])
+            ]
+            if table is not None:
+                entry = {"versions": [version[:3] for version in versions], "values": {}}
+                table["stores"][store_key] = entry
+        else:
+            versions = [(user_key, seq, is_live, None) for user_key, seq, is_live in entry["versions"]]
+
+        for user_key, seq, is_live, raw_record in versions:
+            current = newest.get(user_key)
+            if current is None or current[0] < seq:
+                newest[user_key] = (seq, is_live, entry, raw_record, file)
+
+    winners = [user_key for user_key in sorted(newest) if newest[user_key][1]]
+    values: dict[bytes, Any] = {}
+    pending: dict[int, tuple[bytes, Optional[dict[str, Any]]]] = {}  # seq -> (user_key, table cache entry)
+    to_decode = []
+    to_reread: dict[Any, set[int]] = {}
+    for user_key in winners:
+        seq, _, entry, raw_record, file = newest[user_key]
+        if entry is not None and seq in entry["values"]:
+            values[user_key] = entry["values"][seq]
+            continue
+        pending[seq] = (user_key, entry)
+        if raw_record is not None:
+            to_decode.append(raw_record)
+        else:
+            # cached before it was the newest version of its key, so never decoded
+            to_reread.setdefault(file, set()).add(seq)
+    for file, seqs in to_reread.items():
+        to_decode.extend(record for record in store.iterate_raw_records_in_files([file]) if record.seq in seqs)
 
-    try:
-        for store_name in db.object_store_names:
-            if store_name is None or store_name.startswith("_") or "_partial" in store_name:
-                continue
+    decoded = store.read_records(to_decode, projection=PROJECTED_FIELDS) if to_decode else ()
 
-            try:
-                store = db[store_name]
-                first_record = None
+    def finish() -> list[Any]:
+        for record in decoded:
+            user_key, entry = pending[record.ldb_seq_no]
+            values[user_key] = project_record(record.value)
+            if entry is not None:
+                entry["values"][record.ldb_seq_no] = values[user_key]
+        return [values[user_key] for user_key in winners]
+
+    return finish
+
+
+def _first_record(store: Any) -> Optional[dict[str, Any]]:
+    """
+    Return the value of a store's first live record, or None if it is not an object.
 
-                for record in store.iterate_records():
-                    val = record.value
-                    if not isinstance(val, dict):
-                        break
-                    first_record = val
+    Walks keys only (see WrappedObjectStore.iterate_keys): just the returned value is deserialized.
+    """
+    for key_record in store.iterate_keys(live_only=True):
+        if not key_record.value_length:
+            continue  # empty record
+        val = key_record.value
+        if val is None:
+            continue
+        return val if isinstance(val, dict) else None
+    return None
+
+
+def _iter_linear_databases(wrapper: Any) -> Iterator[Any]:
+    """Yield the WrappedDatabase of each Linear workspace (one per signed-in organization)."""
+    for db_id in wrapper.database_ids:
+        if "linear_" in db_id.name and db_id.name != "linear_databases":
+            candidate = wrapper[db_id.name, db_id.origin]
+            if list(candidate.object_store_names):
+                yield candidate
+
+
+def _find_linear_database(wrapper: Any) -> Any:
+    """Return the WrappedDatabase holding Linear's synced models, or None."""
+    return next(_iter_linear_databases(wrapper), None)
+
+
+def _read_linear_entities(
+    wrapper: Any,
+    dbs: list[Any],
+    table_cache: Optional[dict[str, Any]],
+    store_types: Optional[dict[tuple, Optional[str]]] = None,
+    instrumentation: Any = None,
+) -> list[dict[str, dict[str, dict]]]:
+    """
+    Classify the object stores of each Linear database and collect their live records by id.
+
+    Every database's stores are started before any is gathered, so with jobs > 1 the stores of all
+    of them are decoded concurrently, and they share the open database's block cache.
+    """
+    files = wrapper.data_files
+    pending: list[list[Callable[[], list[Any]]]] = []
+    with _phase(instrumentation, "classify_stores"):
+        for db in dbs:
+            pending.append(_start_linear_entities(db, files, table_cache, store_types, instrumentation))
+
+    result = []
+    with _phase(instrumentation, "decode_stores"):
+        for db_pending in pending:
+            entities: dict[str, dict[str, dict]] = {entity_type: {} for entity_type in ENTITY_TYPES}
+            _gather_linear_entities(db_pending, entities)
+            result.append(entities)
+
+    if table_cache is not None:
+        # evict tables which have since been compacted away
+        live_names = {file.path.name for file in files}
+        for name in list(table_cache):
+            if name not in live_names:
+                del table_cache[name]
+
+    return result
+
+
+def _start_linear_entities(
+    db: Any,
+    files: tuple,
+    table_cache: Optional[dict[str, Any]],
+    store_types: Optional[dict[tuple, Optional[str]]] = None,
+    instrumentation: Any = None,
+) -> list[Callable[[], list[Any]]]:
+    """
+    Start reading each Linear entity store of db (see _read_store_values).
+
+    Stores are classified from their first record, and those which aren't Linear entity stores are
+    skipped. The classification of each non-empty store is kept in store_types when given (the
+    table cache's), so a warm export doesn't read stores to classify them.
+    """
+    pending = []
+    for store_name in db.object_store_names:
+        if store_name is None or store_name.startswith("_") or "_partial" in store_name:
+            continue
+
+        try:
+            store = db[store_name]
+            type_key = (db.name, db.db_number, store.object_store_id, store_name)
+            if store_types is not None and type_key in store_types:
+                entity_type = store_types[type_key]
+            else:
+                first_record = _first_record(store)
+                entity_type = classify_record(first_record or {})
+                if store_types is not None and (first_record is not None or store.count(live_only=True)):
+                    store_types[type_key] = entity_type  # an empty store may yet be filled
+            if entity_type is None:
+                if instrumentation is not None:
+                    instrumentation.count("stores_skipped")
+                continue  # not a Linear entity store: don't deserialize the rest of it
+
+            pending.append(_read_store_values(store, db.db_number, files, table_cache, instrumentation))
+        except Exception:
+            continue
+    return pending
+
+
+def _gather_linear_entities(
+    pending: list[Callable[[], list[Any]]], entities: dict[str, dict[str, dict]]
+) -> None:
+    """Finish each store's pending read and add its live records to entities by type."""
+    for gather_values in pending:
+        try:
+            values = gather_values()
+
+            first_record = None
+            for val in values:
+                if val is None:
+                    continue  # empty record
+                if not isinstance(val, dict):
                     break
+                first_record = val
+                break
 
-                if not first_record:
-                    continue
-
-                if is_project_record(first_record):
-                    for record in store.iterate_records():
-                        if isinstance(record.value, dict) and record.value.get("id"):
-                            projects[record.value["id"]] = record.value
-                elif is_team_record(first_record):
-                    for record in store.iterate_records():
-                        if isinstance(record.value, dict) and record.value.get("id"):
-                            teams[record.value["id"]] = record.value
-                elif is_issue_record(first_record):
-                    for record in store.iterate_records():
-                        if isinstance(record.value, dict) and record.value.get("id"):
-                            issues[record.value["id"]] = record.value
-                elif is_workflow_state_record(first_record):
-                    for record in store.iterate_records():
-                        if isinstance(record.value, dict) and record.value.get("id"):
-                            states[record.value["id"]] = record.value
-                elif is_user_record(first_record):
-                    for record in store.iterate_records():
-                        if isinstance(record.value, dict) and record.value.get("id"):
-                            users[record.value["id"]] = record.value
-                elif is_cycle_record(first_record):
-                    for record in store.iterate_records():
-                        if isinstance(record.value, dict) and record.value.get("id"):
-                            cycles[record.value["id"]] = record.value
-                elif is_label_record(first_record):
-                    for record in store.iterate_records():
-                        if isinstance(record.value, dict) and record.value.get("id"):
-                            labels[record.value["id"]] = record.value
+            if not first_record:
+                continue
 
-            except Exception:
+            entity_type = classify_record(first_record)
+            if entity_type is None:
                 continue
+            target = entities[entity_type]
+            for val in values:
+                if isinstance(val, dict) and val.get("id"):
+                    target[val["id"]] = val
+
+        except Exception:
+            continue
+
+
+def load_linear_data(
+    table_cache_path: Optional[str] = TABLE_CACHE_PATH,
+    cache: Optional[dict[str, Any]] = None,
+    jobs: int = 1,
+    instrumentation: Any = None,
+    watermark: Optional[dict[str, Any]] = None,
+) -> tuple[dict, dict, dict, dict, dict, dict, dict]:
+    """
+    Load projects, teams, issues, states, users, cycles, and labels from Linear IndexedDB.
+
+    Records decoded from table files are cached in table_cache_path (None disables the cache), so a
+    warm export only decodes tables written since the last run plus the log. Cached records only
+    hold PROJECTED_FIELDS. A long-lived caller can pass the cache it got from load_table_cache to
+    keep it in memory between loads; it is updated in place. With jobs > 1, tables are decompressed
+    and decoded by that many worker processes; the result is the same as with one. With an
+    instrumentation (see make_instrumentation), each phase of the load is timed and counted in it.
+    A watermark dict is filled with the LevelDB sequence number and position the data was read at
+    ({"seq", "position"}, as export_delta takes them), taken before any record is read.
+
+    Every entity is held in memory, issues included: record versions are only resolved once every
+    file of a store has been read, and the export needs all of the issues (for recentIssueTitles)
+    before it can write the first project.
+
+    Returns: (projects, teams, issues, states, users, cycles, labels)
+    """
+    with _phase(instrumentation, "load"):
+        data = _load_linear_data(table_cache_path, cache, jobs, instrumentation, watermark)
+    if instrumentation is not None:
+        for entity_type, entities in zip(ENTITY_TYPES, data):
+            instrumentation.count(f"entities.{entity_type}", len(entities))
+    return data
+
+
+def _load_linear_data(
+    table_cache_path: Optional[str],
+    cache: Optional[dict[str, Any]],
+    jobs: int,
+    instrumentation: Any,
+    watermark: Optional[dict[str, Any]] = None,
+) -> tuple[dict, dict, dict, dict, dict, dict, dict]:
+    databases = _load_linear_databases(
+        table_cache_path, cache, jobs, instrumentation, limit=1, watermark=watermark
+    )
+    if not databases:
+        return {}, {}, {}, {}, {}, {}, {}
+    return databases[0][1]
+
+
+def load_linear_workspaces(
+    table_cache_path: Optional[str] = TABLE_CACHE_PATH,
+    cache: Optional[dict[str, Any]] = None,
+    jobs: int = 1,
+    instrumentation: Any = None,
+) -> dict[str, tuple[str, tuple[dict, dict, dict, dict, dict, dict, dict]]]:
+    """
+    Load the entities of every Linear workspace database, as load_linear_data does for the first.
+
+    All of them are read from one open of the LevelDB directory and their stores are decoded
+    together (concurrently with jobs > 1), so the cost is close to that of a single scan.
+
+    Returns: {organization id: (database name, (projects, teams, issues, states, users, cycles, labels))}.
+    A database whose organization can't be told (or is already taken) is keyed by its name instead.
+    """
+    with _phase(instrumentation, "load"):
+        databases = _load_linear_databases(table_cache_path, cache, jobs, instrumentation)
+
+    workspaces: dict[str, tuple[str, tuple[dict, dict, dict, dict, dict, dict, dict]]] = {}
+    for name, data in databases:
+        organization_id = _organization_id(data)
+        if organization_id is None or organization_id in workspaces:
+            organization_id = name
+        workspaces[organization_id] = (name, data)
+        if instrumentation is not None:
+            for entity_type, entities in zip(ENTITY_TYPES, data):
+                instrumentation.count(f"entities.{entity_type}", len(entities))
+    return workspaces
+
+
+def _organization_id(data: tuple[dict, dict, dict, dict, dict, dict, dict]) -> Optional[str]:
+    """Return the organizationId most common among a workspace's teams, projects and users."""
+    counts: dict[str, int] = {}
+    for entity_type in ("teams", "projects", "users"):
+        for entity in data[ENTITY_TYPES.index(entity_type)].values():
+            organization_id = entity.get("organizationId")
+            if isinstance(organization_id, str) and organization_id:
+                counts[organization_id] = counts.get(organization_id, 0) + 1
+    return max(counts, key=counts.__getitem__) if counts else None
+
+
+def _load_linear_databases(
+    table_cache_path: Optional[str],
+    cache: Optional[dict[str, Any]],
+    jobs: int,
+    instrumentation: Any,
+    limit: Optional[int] = None,
+    watermark: Optional[dict[str, Any]] = None,
+) -> list[tuple[str, tuple[dict, dict, dict, dict, dict, dict, dict]]]:
+    """
+    Read the first limit (default: all) Linear databases; returns [(database name, entities)].
+
+    A watermark dict is filled in as described in load_linear_data once the databases are found.
+    """
+    setup_pythonpath()
+    try:
+        from ccl_chromium_reader import ccl_chromium_indexeddb  # type: ignore
+    except ImportError as e:
+        print(f"Error: Failed to import ccl_chromium_reader: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not os.path.exists(LINEAR_DB_PATH):
+        return []
 
+    try:
+        wrapper = ccl_chromium_indexeddb.WrappedIndexDB(
+            LINEAR_DB_PATH, LINEAR_BLOB_PATH, lazy=True, jobs=jobs, instrumentation=instrumentation
+        )
     except Exception as e:
-        print(f"Error: Failed to iterate object stores: {e}", file=sys.stderr)
-        return _empty
+        print(f"Error: Failed to open IndexedDB: {e}", file=sys.stderr)
+        return []
 
-    return projects, teams, issues, states, users, cycles, labels
+    try:
+        try:
+            with _phase(instrumentation, "find_database"):
+                dbs = list(itertools.islice(_iter_linear_databases(wrapper), limit))
+        except Exception as e:
+            print(f"Error: Failed to find Linear database: {e}", file=sys.stderr)
+            return []
+
+        if not dbs:
+            return []
+
+        if watermark is not None:
+            # before reading any record, so that a change made meanwhile is reported again by the next delta
+            seq, position = wrapper.current_position()
+            watermark.update(seq=seq, position=str(position))
+
+        if cache is None and table_cache_path:
+            with _phase(instrumentation, "table_cache_load"):
+                cache = load_table_cache(table_cache_path)
+
+        try:
+            entities = _read_linear_entities(
+                wrapper,
+                dbs,
+                cache["tables"] if cache is not None else None,
+                cache["store_types"] if cache is not None else None,
+                instrumentation,
+            )
+        except Exception as e:
+            print(f"Error: Failed to iterate object stores: {e}", file=sys.stderr)
+            return []
+    finally:
+        wrapper.close()
+
+    if cache is not None and table_cache_path:
+        with _phase(instrumentation, "table_cache_save"):
+            save_table_cache(table_cache_path, cache)
+
+    return [
+        (db.name, tuple(db_entities[entity_type] for entity_type in ENTITY_TYPES))
+        for db, db_entities in zip(dbs, entities)
+    ]
 
 
 def get_team_info(project: dict[str, Any], teams: dict[str, Any]) -> tuple[str, str]:
@@ -202,6 +635,66 @@ def get_team_info(project: dict[str, Any], teams: dict[str, Any]) -> tuple[str,
     return team_id, team_name
 
 
+class EntityIndex:
+    """
+    Issues indexed in a single pass over the loaded entities.
+
+    States are classified as active or not up front. Issue ids are grouped by each field in
+    group_by (ids in load order, string values only). For every project, a bounded heap keeps
+    the recent_limit most recently updated active issues with a title, ranked exactly as a
+    stable sort on updatedAt (descending) would rank them; a recent_limit of 0 keeps no titles.
+    """
+
+    def __init__(
+        self,
+        issues: dict[str, Any],
+        states: dict[str, Any],
+        recent_limit: int = RECENT_ISSUES_LIMIT,
+        group_by: tuple[str, ...] = ISSUE_GROUP_FIELDS,
+    ):
+        self.issues = issues
+        self.recent_limit = recent_limit
+        self.state_types = {state_id: state.get("type", "") for state_id, state in states.items()}
+        inactive_states = {
+            state_id
+            for state_id, state_type in self.state_types.items()
+            if state_type in INACTIVE_STATE_TYPES
+        }
+        self.groups: dict[str, dict[Any, list[str]]] = {field: {} for field in group_by}
+        # project id -> min-heap of (updatedAt, -load position, title)
+        recent: dict[Any, list[tuple[Any, int, str]]] = {}
+
+        for position, (issue_id, issue) in enumerate(issues.items()):
+            for field, groups in self.groups.items():
+                value = issue.get(field)
+                if isinstance(value, str):
+                    groups.setdefault(value, []).append(issue_id)
+
+            # Issues without a stateId are included (conservative)
+            if recent_limit <= 0 or not issue.get("title") or issue.get("stateId") in inactive_states:
+                continue
+            entry = (issue.get("updatedAt", ""), -position, issue["title"])
+            heap = recent.setdefault(issue.get("projectId"), [])
+            if len(heap) < recent_limit:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+
+        self._recent = recent
+
+    def is_active_state(self, state_id: Optional[str]) -> bool:
+        """Whether issues in this state count as active (no state or an unknown one counts)."""
+        return not state_id or self.state_types.get(state_id, "") not in INACTIVE_STATE_TYPES
+
+    def issue_ids_by(self, field: str, value: Any) -> list[str]:
+        """Ids of the issues whose field equals the string value; field must be one of group_by."""
+        return self.groups[field].get(value, [])
+
+    def recent_issue_titles(self, project_id: str) -> list[str]:
+        """Titles of a project's most recently updated active issues, newest first."""
+        return [entry[2] for entry in sorted(self._recent.get(project_id, ()), reverse=True)]
+
+
 def get_recent_issues(
     project_id: str, issues: dict[str, Any], states: dict[str, Any]
 ) -> list[str]:
@@ -209,158 +702,547 @@ def get_recent_issues(
     Get top 10 recent non-completed/canceled issue titles for a project.
 
     Sorted by updatedAt descending. Includes issues without stateId (conservative).
+    For more than one project, build an EntityIndex once instead.
     """
+    return EntityIndex(issues, states, group_by=()).recent_issue_titles(project_id)
 
-    def is_active(issue: dict[str, Any]) -> bool:
-        state_id = issue.get("stateId")
-        if not state_id:
-            return True
-        state = states.get(state_id, {})
-        state_type = state.get("type", "")
-        return state_type not in ("completed", "canceled")
 
-    project_issues = [
-        issue
-        for issue in issues.values()
-        if issue.get("projectId") == project_id and is_active(issue) and issue.get("title")
-    ]
+def select_issues(
+    issues: dict[str, Any],
+    index: Optional[EntityIndex] = None,
+    team_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    updated_since: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[str]:
+    """
+    Return the ids of the issues matching the filters, most recently updated first.
 
-    sorted_issues = sorted(
-        project_issues, key=lambda x: x.get("updatedAt", ""), reverse=True
-    )
+    updated_since is compared with updatedAt as an ISO 8601 string. The team and project filters
+    use index's groups when it has them. With a limit, only the newest issues are kept (heap
+    selection) rather than sorting every match.
+    """
+    candidates: Any = issues.keys()
+    for field, value in (("projectId", project_id), ("teamId", team_id)):
+        if value is not None and index is not None and field in index.groups:
+            candidates = index.issue_ids_by(field, value)
+            break
+
+    ranked = []
+    for position, issue_id in enumerate(candidates):
+        issue = issues[issue_id]
+        if team_id is not None and issue.get("teamId") != team_id:
+            continue
+        if project_id is not None and issue.get("projectId") != project_id:
+            continue
+        updated_at = issue.get("updatedAt") or ""
+        if updated_since is not None and not (isinstance(updated_at, str) and updated_at >= updated_since):
+            continue
+        ranked.append((str(updated_at), -position, issue_id))
+
+    if limit is not None:
+        ranked = heapq.nlargest(max(limit, 0), ranked)
+    else:
+        ranked.sort(reverse=True)
+    return [entry[2] for entry in ranked]
+
+
+def _team_entry(team: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": team.get("id", ""),
+        "name": team.get("name", ""),
+        "key": team.get("key", ""),
+        "issueEstimationType": team.get("issueEstimationType", "fibonacci"),
+        "issueEstimationAllowZero": team.get("issueEstimationAllowZero", False),
+        "issueEstimationExtended": team.get("issueEstimationExtended", False),
+    }
 
-    return [issue["title"] for issue in sorted_issues[:10]]
 
+def _project_entry(project_id: str, project: dict[str, Any]) -> dict[str, Any]:
+    """The export entry of a project, less recentIssueTitles (which needs every issue)."""
+    return {
+        "id": project_id,
+        "name": project.get("name", ""),
+        "teamIds": project.get("teamIds", []),
+        "statusId": project.get("statusId", ""),
+        "description": project.get("description", ""),
+    }
 
-def export_all() -> dict[str, Any]:
-    """Export all 6 data types from Linear IndexedDB as version 3 JSON."""
-    projects_raw, teams_raw, issues_raw, states_raw, users_raw, cycles_raw, labels_raw = (
-        load_linear_data()
-    )
 
-    now = datetime.now(timezone.utc).isoformat()
+def _user_entry(user: dict[str, Any]) -> dict[str, Any]:
+    entry = {
+        "id": user.get("id", ""),
+        "name": user.get("name", ""),
+        "email": user.get("email", ""),
+    }
+    if user.get("avatarUrl"):
+        entry["avatarUrl"] = user["avatarUrl"]
+    if user.get("displayName"):
+        entry["displayName"] = user["displayName"]
+    return entry
+
+
+def _state_entry(state: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": state.get("id", ""),
+        "name": state.get("name", ""),
+        "type": state.get("type", ""),
+        "color": state.get("color", ""),
+        "teamId": state.get("teamId", ""),
+    }
 
-    cached_teams = []
-    teams_has_estimation = False
-    for team in teams_raw.values():
-        entry = {
-            "id": team.get("id", ""),
-            "name": team.get("name", ""),
-            "key": team.get("key", ""),
-            "issueEstimationType": team.get("issueEstimationType", "fibonacci"),
-            "issueEstimationAllowZero": team.get("issueEstimationAllowZero", False),
-            "issueEstimationExtended": team.get("issueEstimationExtended", False),
-        }
-        if "issueEstimationType" in team:
-            teams_has_estimation = True
-        cached_teams.append(entry)
-
-    cached_projects = []
-    for project_id, project in projects_raw.items():
-        recent_issues = get_recent_issues(project_id, issues_raw, states_raw)
-        cached_projects.append({
-            "id": project_id,
-            "name": project.get("name", ""),
-            "teamIds": project.get("teamIds", []),
-            "statusId": project.get("statusId", ""),
-            "description": project.get("description", ""),
-            "recentIssueTitles": recent_issues,
-        })
-
-    cached_users = []
-    for user in users_raw.values():
-        entry = {
-            "id": user.get("id", ""),
-            "name": user.get("name", ""),
-            "email": user.get("email", ""),
-        }
-        if user.get("avatarUrl"):
-            entry["avatarUrl"] = user["avatarUrl"]
-        if user.get("displayName"):
-            entry["displayName"] = user["displayName"]
-        cached_users.append(entry)
-
-    cached_states = []
-    for state in states_raw.values():
-        cached_states.append({
-            "id": state.get("id", ""),
-            "name": state.get("name", ""),
-            "type": state.get("type", ""),
-            "color": state.get("color", ""),
-            "teamId": state.get("teamId", ""),
-        })
-
-    cached_cycles = []
-    for cycle in cycles_raw.values():
-        ends_at = cycle.get("endsAt", "")
-        if ends_at and ends_at > now:
-            cached_cycles.append({
-                "id": cycle.get("id", ""),
-                "number": cycle.get("number", 0),
-                "startsAt": cycle.get("startsAt", ""),
-                "endsAt": ends_at,
-                "teamId": cycle.get("teamId", ""),
-            })
-
-    cached_labels = []
-    for label in labels_raw.values():
-        cached_labels.append({
-            "id": label.get("id", ""),
-            "name": label.get("name", ""),
-            "color": label.get("color", ""),
-            "isGroup": label.get("isGroup", False),
-        })
-
-    sample_label_keys = set()
-    if labels_raw:
-        sample_label_keys = set(next(iter(labels_raw.values())).keys())
-
-    sample_cycle_keys = set()
-    if cycles_raw:
-        sample_cycle_keys = set(next(iter(cycles_raw.values())).keys())
-
-    sample_project_keys = set()
-    if projects_raw:
-        sample_project_keys = set(next(iter(projects_raw.values())).keys())
 
+def _cycle_entry(cycle: dict[str, Any], now: str) -> Optional[dict[str, Any]]:
+    """The export entry of a cycle, or None if it has already ended."""
+    ends_at = cycle.get("endsAt", "")
+    if not ends_at or ends_at <= now:
+        return None
     return {
+        "id": cycle.get("id", ""),
+        "number": cycle.get("number", 0),
+        "startsAt": cycle.get("startsAt", ""),
+        "endsAt": ends_at,
+        "teamId": cycle.get("teamId", ""),
+    }
+
+
+def _label_entry(label: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": label.get("id", ""),
+        "name": label.get("name", ""),
+        "color": label.get("color", ""),
+        "isGroup": label.get("isGroup", False),
+    }
+
+
+def _issue_entry(issue: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": issue.get("id", ""),
+        "title": issue.get("title", ""),
+        "number": issue.get("number", 0),
+        "teamId": issue.get("teamId", ""),
+        "projectId": issue.get("projectId") or "",
+        "stateId": issue.get("stateId") or "",
+        "updatedAt": issue.get("updatedAt", ""),
+    }
+
+
+def iter_export_sections(
+    data: tuple[dict, dict, dict, dict, dict, dict, dict],
+    index: EntityIndex,
+    now: str,
+    issue_query: Optional[dict[str, Any]] = None,
+) -> Iterator[tuple[str, Iterator[dict[str, Any]]]]:
+    """
+    Yield (section name, entries) for each entity list of the version 3 export, in payload order.
+
+    Entries are built one at a time as they are consumed. The issues section is empty unless
+    issue_query is given: a dict with optional "teamId", "projectId", "updatedSince" and "limit"
+    keys (see select_issues).
+    """
+    projects_raw, teams_raw, issues_raw, states_raw, users_raw, cycles_raw, labels_raw = data
+
+    def projects() -> Iterator[dict[str, Any]]:
+        for project_id, project in projects_raw.items():
+            entry = _project_entry(project_id, project)
+            entry["recentIssueTitles"] = index.recent_issue_titles(project_id)
+            yield entry
+
+    def cycles() -> Iterator[dict[str, Any]]:
+        for cycle in cycles_raw.values():
+            entry = _cycle_entry(cycle, now)
+            if entry is not None:
+                yield entry
+
+    def issues() -> Iterator[dict[str, Any]]:
+        if issue_query is None:
+            return
+        issue_ids = select_issues(
+            issues_raw,
+            index,
+            team_id=issue_query.get("teamId"),
+            project_id=issue_query.get("projectId"),
+            updated_since=issue_query.get("updatedSince"),
+            limit=issue_query.get("limit"),
+        )
+        for issue_id in issue_ids:
+            yield _issue_entry(issues_raw[issue_id])
+
+    yield "teams", map(_team_entry, teams_raw.values())
+    yield "projects", projects()
+    yield "users", map(_user_entry, users_raw.values())
+    yield "states", map(_state_entry, states_raw.values())
+    yield "cycles", cycles()
+    yield "labels", map(_label_entry, labels_raw.values())
+    yield "issues", issues()
+
+
+def export_meta(
+    data: tuple[dict, dict, dict, dict, dict, dict, dict],
+    now: str,
+    watermark: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """
+    Build the _meta section of the version 3 export: which entities and fields were found.
+
+    With the watermark data was loaded at (see load_linear_data), _meta["watermark"] holds it, for
+    export_delta to carry on from.
+    """
+    projects_raw, teams_raw, issues_raw, states_raw, users_raw, cycles_raw, labels_raw = data
+
+    def sample_keys(entities: dict[str, Any]) -> set[str]:
+        return set(next(iter(entities.values())).keys()) if entities else set()
+
+    sample_label_keys = sample_keys(labels_raw)
+    sample_cycle_keys = sample_keys(cycles_raw)
+    sample_project_keys = sample_keys(projects_raw)
+
+    meta = {
+        "exportedAt": now,
+        "teams_found": bool(teams_raw),
+        "projects_found": bool(projects_raw),
+        "users_found": bool(users_raw),
+        "states_found": bool(states_raw),
+        "cycles_found": bool(cycles_raw),
+        "labels_found": bool(labels_raw),
+        "teams_has_estimation_fields": any("issueEstimationType" in team for team in teams_raw.values()),
+        "projects_has_state_field": "state" in sample_project_keys,
+        "labels_has_team_id": "teamId" in sample_label_keys,
+        "labels_has_parent_id": "parentId" in sample_label_keys,
+        "cycles_has_name": "name" in sample_cycle_keys,
+    }
+    if watermark:
+        meta["watermark"] = watermark
+    return meta
+
+
+def export_all(
+    table_cache_path: Optional[str] = TABLE_CACHE_PATH,
+    data: Optional[tuple[dict, dict, dict, dict, dict, dict, dict]] = None,
+    jobs: int = 1,
+    index: Optional[EntityIndex] = None,
+    recent_limit: int = RECENT_ISSUES_LIMIT,
+    issue_query: Optional[dict[str, Any]] = None,
+    instrumentation: Any = None,
+    watermark: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """
+    Export all 6 data types from Linear IndexedDB as version 3 JSON.
+
+    data: entities already returned by load_linear_data (the database is read when omitted).
+    watermark: the watermark data was loaded at, for _meta (see export_meta); when the database is
+        read here, it's the watermark of that read.
+    jobs: worker processes to read the database with (see load_linear_data).
+    index: an EntityIndex of data's issues and states (built with recent_limit when omitted).
+    issue_query: include the matching issues (see iter_export_sections); issues is empty otherwise.
+    instrumentation: times the export's phases and reports them in _meta["instrumentation"].
+    """
+    if data is None:
+        watermark = {}
+        data = load_linear_data(
+            table_cache_path, jobs=jobs, instrumentation=instrumentation, watermark=watermark
+        )
+    if index is None:
+        with _phase(instrumentation, "index"):
+            index = _export_index(data, recent_limit, issue_query)
+
+    now = datetime.now(timezone.utc).isoformat()
+    payload: dict[str, Any] = {"version": 3, "updatedAt": now}
+    with _phase(instrumentation, "serialize"):
+        for section, entries in iter_export_sections(data, index, now, issue_query):
+            payload[section] = list(entries)
+        payload["_meta"] = export_meta(data, now, watermark)
+    if instrumentation is not None:
+        payload["_meta"]["instrumentation"] = instrumentation.as_dict()
+    return payload
+
+
+def export_workspaces(
+    table_cache_path: Optional[str] = TABLE_CACHE_PATH,
+    jobs: int = 1,
+    recent_limit: int = RECENT_ISSUES_LIMIT,
+    issue_query: Optional[dict[str, Any]] = None,
+    instrumentation: Any = None,
+) -> dict[str, Any]:
+    """
+    Export every Linear workspace in the IndexedDB cache, keyed by organization.
+
+    Returns {"version": 3, "updatedAt", "organizations": {organization id: {"database": name, ...}}}
+    where each organization holds the sections and _meta that export_all() gives for its workspace
+    (see load_linear_workspaces for the keys). The database is read once for all of them.
+    instrumentation: times the export's phases and reports them in the top level _meta.
+    """
+    workspaces = load_linear_workspaces(table_cache_path, jobs=jobs, instrumentation=instrumentation)
+
+    payload: dict[str, Any] = {"version": 3, "updatedAt": datetime.now(timezone.utc).isoformat()}
+    organizations: dict[str, Any] = {}
+    for organization_id, (name, data) in workspaces.items():
+        export = export_all(
+            data=data, recent_limit=recent_limit, issue_query=issue_query, instrumentation=instrumentation
+        )
+        del export["version"], export["updatedAt"]
+        export["_meta"].pop("instrumentation", None)
+        organizations[organization_id] = {"database": name, **export}
+    payload["organizations"] = organizations
+    if instrumentation is not None:
+        payload["_meta"] = {"instrumentation": instrumentation.as_dict()}
+    return payload
+
+
+def export_delta(
+    since_seq: int,
+    position: Optional[str] = None,
+    issue_query: Optional[dict[str, Any]] = None,
+    instrumentation: Any = None,
+) -> dict[str, Any]:
+    """
+    Export the Linear entities changed since LevelDB sequence number since_seq.
+
+    position is the watermark["position"] of the export which saw since_seq: with it, only the
+    tables written since and the rest of the log are read, so the cost follows the amount of
+    change; without it every file is read (and filtered by sequence number). A malformed position
+    raises ValueError. Returns
+
+      {"version": 3, "updatedAt", "sinceSeq", "watermark": {"seq", "position"}, "resync",
+       "upserts": {section: [entries]}, "deletes": [ids]}
+
+    Upserted entries are shaped as in export_all(), except that projects carry no
+    recentIssueTitles; issues are included only with an issue_query (see iter_export_sections),
+    whose filters apply to the changed issues. deletes holds the ids deleted from the Linear
+    entity stores (see _classify_changed_stores); deleted issues are likewise only included with
+    an issue_query, and all of them, since a deleted issue's fields can't be filtered on.
+
+    resync is true when deletions may be missing, because a compaction has since removed tables
+    (and may have dropped deletion markers with them), because no position was given or because a
+    store emptied by its deletions can't be classified; a full export brings the caller back in
+    step. Pass the watermark to the next delta; a full export's _meta["watermark"] (see
+    export_meta) can start the first one.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    payload: dict[str, Any] = {
         "version": 3,
         "updatedAt": now,
-        "teams": cached_teams,
-        "projects": cached_projects,
-        "users": cached_users,
-        "states": cached_states,
-        "cycles": cached_cycles,
-        "labels": cached_labels,
-        "issues": [],
-        "_meta": {
-            "exportedAt": now,
-            "teams_found": bool(teams_raw),
-            "projects_found": bool(projects_raw),
-            "users_found": bool(users_raw),
-            "states_found": bool(states_raw),
-            "cycles_found": bool(cycles_raw),
-            "labels_found": bool(labels_raw),
-            "teams_has_estimation_fields": teams_has_estimation,
-            "projects_has_state_field": "state" in sample_project_keys,
-            "labels_has_team_id": "teamId" in sample_label_keys,
-            "labels_has_parent_id": "parentId" in sample_label_keys,
-            "cycles_has_name": "name" in sample_cycle_keys,
-        },
+        "sinceSeq": since_seq,
+        "watermark": {"seq": since_seq, "position": position},
+        "resync": position is None,
+        "upserts": {section: [] for section in EXPORT_SECTIONS},
+        "deletes": [],
     }
 
+    setup_pythonpath()
+    try:
+        from ccl_chromium_reader import ccl_chromium_indexeddb  # type: ignore
+        from ccl_chromium_reader.storage_formats import ccl_leveldb  # type: ignore
+    except ImportError as e:
+        print(f"Error: Failed to import ccl_chromium_reader: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    tail_position = ccl_leveldb.TailPosition.from_string(position) if position else None
+
+    if not os.path.exists(LINEAR_DB_PATH):
+        return payload
+
+    try:
+        wrapper = ccl_chromium_indexeddb.WrappedIndexDB(
+            LINEAR_DB_PATH, LINEAR_BLOB_PATH, lazy=True, instrumentation=instrumentation
+        )
+    except Exception as e:
+        print(f"Error: Failed to open IndexedDB: {e}", file=sys.stderr)
+        return payload
+
+    try:
+        try:
+            with _phase(instrumentation, "find_database"):
+                db = _find_linear_database(wrapper)
+        except Exception as e:
+            print(f"Error: Failed to find Linear database: {e}", file=sys.stderr)
+            return payload
+        if not db:
+            return payload
+
+        try:
+            with _phase(instrumentation, "read_changes"):
+                records, new_position = db.read_changes(
+                    since_seq, tail_position, bad_deserializer_data_handler=lambda key, value: None,
+                    projection=PROJECTED_FIELDS
+                )
+                if tail_position is not None:
+                    payload["resync"] = wrapper.tables_removed_since(tail_position)
+                store_types = _classify_changed_stores(db, records)
+                if len(store_types) < len({record.obj_store_id for record in records}):
+                    payload["resync"] = True  # a store's deletions can't be sorted into entity types
+        except Exception as e:
+            print(f"Error: Failed to read changes: {e}", file=sys.stderr)
+            return payload
+    finally:
+        wrapper.close()
+
+    with _phase(instrumentation, "serialize"):
+        upserts = _delta_upserts(records, store_types, payload["deletes"], issue_query is not None)
+        sections = payload["upserts"]
+        sections["teams"] = [_team_entry(team) for team in upserts["teams"].values()]
+        sections["projects"] = [
+            _project_entry(project_id, project) for project_id, project in upserts["projects"].items()
+        ]
+        sections["users"] = [_user_entry(user) for user in upserts["users"].values()]
+        sections["states"] = [_state_entry(state) for state in upserts["states"].values()]
+        cycles = (_cycle_entry(cycle, now) for cycle in upserts["cycles"].values())
+        sections["cycles"] = [entry for entry in cycles if entry is not None]
+        sections["labels"] = [_label_entry(label) for label in upserts["labels"].values()]
+        if issue_query is not None:
+            issues = upserts["issues"]
+            issue_ids = select_issues(
+                issues,
+                team_id=issue_query.get("teamId"),
+                project_id=issue_query.get("projectId"),
+                updated_since=issue_query.get("updatedSince"),
+                limit=issue_query.get("limit"),
+            )
+            sections["issues"] = [_issue_entry(issues[issue_id]) for issue_id in issue_ids]
+
+    payload["watermark"] = {
+        "seq": max([since_seq] + [record.ldb_seq_no for record in records]),
+        "position": str(new_position),
+    }
+    if instrumentation is not None:
+        instrumentation.count("delta.records", len(records))
+        instrumentation.count("delta.deletes", len(payload["deletes"]))
+        payload["_meta"] = {"instrumentation": instrumentation.as_dict()}
+    return payload
+
+
+def _classify_changed_stores(db: Any, records: list[Any]) -> dict[int, Optional[str]]:
+    """
+    Return the entity type of each object store with changed records (ordered by store), or None.
+
+    As with a full load, a store is classified by its first object value, and stores whose names
+    mark them as internal or partial are skipped. The first changed value is used; only a store
+    whose changes are all deletions is read for its first live record (see _first_record). A store
+    with no live record left can't be classified and is left out.
+    """
+    store_types: dict[int, Optional[str]] = {}
+    for store_id, store_records in itertools.groupby(records, key=lambda record: record.obj_store_id):
+        store = db[store_id]
+        store_name = store.name
+        if store_name is None or store_name.startswith("_") or "_partial" in store_name:
+            store_types[store_id] = None
+            continue
+
+        values = (project_record(record.value) for record in store_records if record.is_live)
+        first_record = next((value for value in values if value is not None), None)
+        if first_record is None:
+            first_record = _first_record(store)
+            if first_record is None and not store.count(live_only=True):
+                continue
+        store_types[store_id] = classify_record(first_record) if isinstance(first_record, dict) else None
+    return store_types
+
+
+def _delta_upserts(
+    records: list[Any], store_types: dict[int, Optional[str]], deletes: list[str], include_issues: bool
+) -> dict[str, dict[str, dict]]:
+    """
+    Sort changed records (ordered by store) into live entities by type, and add deleted ids to deletes.
+
+    Only the stores classified as entity stores in store_types are used; deleted issues are only
+    added with include_issues.
+    """
+    entities: dict[str, dict[str, dict]] = {entity_type: {} for entity_type in ENTITY_TYPES}
+    for store_id, store_records in itertools.groupby(records, key=lambda record: record.obj_store_id):
+        entity_type = store_types.get(store_id)
+        if entity_type is None:
+            continue
+
+        for record in store_records:
+            if not record.is_live:
+                if isinstance(record.key.value, str) and (include_issues or entity_type != "issues"):
+                    deletes.append(record.key.value)
+                continue
+            value = project_record(record.value)
+            if isinstance(value, dict) and value.get("id"):
+                entities[entity_type][value["id"]] = value
+    return entities
+
+
+def _export_index(
+    data: tuple[dict, dict, dict, dict, dict, dict, dict],
+    recent_limit: int,
+    issue_query: Optional[dict[str, Any]],
+) -> EntityIndex:
+    """Index data for one export, grouping issues only when the issue filters can use it."""
+    group_by: tuple[str, ...] = ()
+    if issue_query is not None:
+        group_by = tuple(field for field in ("projectId", "teamId") if issue_query.get(field) is not None)
+    issues = data[ENTITY_TYPES.index("issues")]
+    states = data[ENTITY_TYPES.index("states")]
+    return EntityIndex(issues, states, recent_limit, group_by=group_by)
+
+
+def write_export(
+    out: Any,
+    data: tuple[dict, dict, dict, dict, dict, dict, dict],
+    index: EntityIndex,
+    fmt: str = "json",
+    issue_query: Optional[dict[str, Any]] = None,
+    instrumentation: Any = None,
+    watermark: Optional[dict[str, Any]] = None,
+) -> None:
+    """
+    Stream the version 3 export to out, one entity at a time.
+
+    fmt "json" writes the same document as export_all() as compact JSON. fmt "ndjson" writes one
+    JSON object per line: {"section": "header", "data": {"version", "updatedAt"}}, then
+    {"section": <name>, "data": <entry>} for every entry of every section, then
+    {"section": "_meta", "data": {...}}. With an instrumentation, _meta["instrumentation"] holds
+    its timings, including writing everything before _meta, and _meta["watermark"] the watermark
+    data was loaded at, if given (see export_meta).
+
+    Only the output is streamed: data is already fully in memory (see load_linear_data), so this
+    saves building the output document, not holding the entities.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+
+    def dumps(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    sections = iter_export_sections(data, index, now, issue_query)
+    with _phase(instrumentation, "serialize"):
+        if fmt == "ndjson":
+            out.write(dumps({"section": "header", "data": {"version": 3, "updatedAt": now}}) + "\n")
+            for section, entries in sections:
+                for entry in entries:
+                    out.write(dumps({"section": section, "data": entry}) + "\n")
+        else:
+            out.write('{"version":3,"updatedAt":' + dumps(now))
+            for section, entries in sections:
+                out.write("," + dumps(section) + ":[")
+                separator = ""
+                for entry in entries:
+                    out.write(separator + dumps(entry))
+                    separator = ","
+                out.write("]")
+
+    meta = export_meta(data, now, watermark)
+    if instrumentation is not None:
+        meta["instrumentation"] = instrumentation.as_dict()
+    if fmt == "ndjson":
+        out.write(dumps({"section": "_meta", "data": meta}) + "\n")
+    else:
+        out.write(',"_meta":' + dumps(meta) + "}\n")
+
 
 def export_projects() -> dict[str, Any]:
     """Deprecated: Use export_all() instead."""
     return export_all()
 
 
-def discover_stores() -> dict[str, Any]:
+def discover_stores(all_workspaces: bool = False) -> dict[str, Any]:
     """
     Discover all object stores in Linear IndexedDB with field-level detail.
 
     Returns JSON with store info including sample keys, sample record, and
-    analysis of critical fields needed for cache integration.
+    analysis of critical fields needed for cache integration. With all_workspaces,
+    every Linear database is described: {"databases": {name: <store info>}}.
     """
     setup_pythonpath()
     try:
@@ -373,25 +1255,47 @@ def discover_stores() -> dict[str, Any]:
         return {"stores": [], "note": "Linear Desktop App not installed"}
 
     try:
-        wrapper = ccl_chromium_indexeddb.WrappedIndexDB(LINEAR_DB_PATH, LINEAR_BLOB_PATH)
+        wrapper = ccl_chromium_indexeddb.WrappedIndexDB(LINEAR_DB_PATH, LINEAR_BLOB_PATH, lazy=True)
     except Exception as e:
         print(f"Error: Failed to open IndexedDB: {e}", file=sys.stderr)
         return {"stores": [], "error": str(e)}
 
-    db = None
     try:
-        for db_id in wrapper.database_ids:
-            if "linear_" in db_id.name and db_id.name != "linear_databases":
-                candidate = wrapper[db_id.name, db_id.origin]
-                if list(candidate.object_store_names):
-                    db = candidate
-                    break
+        if all_workspaces:
+            return _discover_all_stores(wrapper)
+        return _discover_stores(wrapper)
+    finally:
+        wrapper.close()
+
+
+def _discover_stores(wrapper: Any) -> dict[str, Any]:
+    """Describe the object stores of the Linear database in an open WrappedIndexDB."""
+    try:
+        db = _find_linear_database(wrapper)
     except Exception as e:
         return {"stores": [], "error": f"Failed to find Linear database: {e}"}
 
     if not db:
         return {"stores": [], "note": "No Linear database found"}
 
+    return _discover_database_stores(db)
+
+
+def _discover_all_stores(wrapper: Any) -> dict[str, Any]:
+    """Describe the object stores of every Linear database in an open WrappedIndexDB."""
+    try:
+        dbs = list(_iter_linear_databases(wrapper))
+    except Exception as e:
+        return {"databases": {}, "error": f"Failed to find Linear databases: {e}"}
+
+    if not dbs:
+        return {"databases": {}, "note": "No Linear database found"}
+
+    return {"databases": {db.name: _discover_database_stores(db) for db in dbs}}
+
+
+def _discover_database_stores(db: Any) -> dict[str, Any]:
+    """Describe the object stores of one Linear database."""
     stores_info: list[dict[str, Any]] = []
 
     try:
@@ -409,18 +1313,8 @@ def discover_stores() -> dict[str, Any]:
 
             try:
                 store = db[store_name]
-                count = 0
-                first_record = None
-
-                for record in store.iterate_records():
-                    val = record.value
-                    if not isinstance(val, dict):
-                        break
-                    if first_record is None:
-                        first_record = val
-                    count += 1
-
-                store_data["record_count_estimate"] = count
+                first_record = _first_record(store)
+                store_data["record_count_estimate"] = store.count(live_only=True) if first_record else 0
 
                 if first_record:
                     store_data["sample_keys"] = sorted(list(first_record.keys()))
@@ -504,24 +1398,357 @@ def _is_label_like(record: dict[str, Any]) -> bool:
     return color.startswith("#") and len(color) <= 10
 
 
+def db_dir_signature() -> Optional[tuple[tuple[str, int, int], ...]]:
+    """Return (name, size, mtime_ns) for each file in the LevelDB directory, or None if it's missing."""
+    try:
+        entries = os.scandir(LINEAR_DB_PATH)
+    except OSError:
+        return None
+    signature = []
+    with entries:
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # removed by a compaction while listing
+            signature.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(sorted(signature))
+
+
+class ExportServer:
+    """
+    Answers JSON-lines requests against Linear data kept in memory between requests.
+
+    Each request is a JSON object {"id": ..., "method": ..., "params": {...}} on one line; each
+    response is {"id": ..., "result": ...} or {"id": ..., "error": "..."} on one line. Methods:
+
+      export    the export_all() payload; params["issues"] (an issue_query, see
+                iter_export_sections) includes the matching issues
+      discover  the discover_stores() payload
+      query     entities of params["type"] (one of ENTITY_TYPES), optionally narrowed by
+                params["id"], params["where"] (field equality) and params["limit"]; issue
+                queries on a field the EntityIndex groups by only visit that group
+      ping      "pong"
+      shutdown  stop serving after responding
+
+    Before answering, the LevelDB directory listing (names, sizes, mtimes) is compared with the one
+    the data was loaded from. When it has changed the database is reopened; the in-memory table
+    cache means only new tables and the log are decoded again.
+
+    With instrument, every request is instrumented afresh (see make_instrumentation): phases are
+    reported to stderr as they finish, a summary follows the response on stderr and exports carry
+    it in _meta["instrumentation"].
+    """
+
+    def __init__(
+        self,
+        table_cache_path: Optional[str] = TABLE_CACHE_PATH,
+        jobs: int = 1,
+        recent_limit: int = RECENT_ISSUES_LIMIT,
+        group_by: tuple[str, ...] = ISSUE_GROUP_FIELDS,
+        instrument: bool = False,
+    ):
+        self._table_cache_path = table_cache_path
+        self._jobs = jobs
+        self._recent_limit = recent_limit
+        self._group_by = group_by
+        self._instrument = instrument
+        self._cache = load_table_cache(table_cache_path) if table_cache_path else None
+        self._signature: Any = None
+        self._data: Optional[tuple[dict, dict, dict, dict, dict, dict, dict]] = None
+        self._watermark: dict[str, Any] = {}
+        self._index: Optional[EntityIndex] = None
+        self.running = True
+
+    def refresh(self, instrumentation: Any = None) -> tuple[dict, dict, dict, dict, dict, dict, dict]:
+        """Return the loaded entities, reloading and reindexing them if the LevelDB directory has changed."""
+        signature = db_dir_signature()
+        if self._data is None or signature != self._signature:
+            self._watermark = {}
+            self._data = load_linear_data(
+                self._table_cache_path, self._cache, self._jobs, instrumentation, self._watermark
+            )
+            with _phase(instrumentation, "index"):
+                self._index = EntityIndex(
+                    self._data[ENTITY_TYPES.index("issues")],
+                    self._data[ENTITY_TYPES.index("states")],
+                    self._recent_limit,
+                    self._group_by,
+                )
+            self._signature = signature
+        return self._data
+
+    def query(self, params: dict[str, Any], instrumentation: Any = None) -> Any:
+        """Return entities of one type, filtered as described in the class docstring."""
+        entity_type = params.get("type")
+        if entity_type not in ENTITY_TYPES:
+            raise ValueError(f"Unknown entity type: {entity_type!r}")
+        entities = self.refresh(instrumentation)[ENTITY_TYPES.index(entity_type)]
+
+        if "id" in params:
+            return entities.get(params["id"])
+
+        where = params.get("where") or {}
+        limit = params.get("limit")
+        candidates = entities.values()
+        if entity_type == "issues":
+            grouped = [f for f in where if f in self._index.groups and isinstance(where[f], str)]
+            if grouped:
+                issue_ids = self._index.issue_ids_by(grouped[0], where[grouped[0]])
+                candidates = (entities[issue_id] for issue_id in issue_ids)
+
+        result = []
+        for entity in candidates:
+            if all(entity.get(field) == value for field, value in where.items()):
+                result.append(entity)
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer one request."""
+        method = request.get("method")
+        params = request.get("params") or {}
+        instrumentation = make_instrumentation() if self._instrument else None
+        try:
+            if method == "export":
+                data = self.refresh(instrumentation)
+                result: Any = export_all(
+                    data=data,
+                    index=self._index,
+                    issue_query=params.get("issues"),
+                    instrumentation=instrumentation,
+                    watermark=self._watermark,
+                )
+            elif method == "discover":
+                result = discover_stores()
+            elif method == "query":
+                result = self.query(params, instrumentation)
+            elif method == "ping":
+                result = "pong"
+            elif method == "shutdown":
+                self.running = False
+                result = None
+            else:
+                raise ValueError(f"Unknown method: {method!r}")
+        except Exception as e:
+            return {"id": request.get("id"), "error": str(e)}
+        finally:
+            if instrumentation is not None:
+                summary = {"instrumentation": "summary", "method": method, **instrumentation.as_dict()}
+                print(json.dumps(summary), file=sys.stderr, flush=True)
+        return {"id": request.get("id"), "result": result}
+
+    def serve(self, infile: Any = None, outfile: Any = None) -> None:
+        """Answer requests from infile (stdin) on outfile (stdout) until EOF or shutdown."""
+        infile = infile or sys.stdin
+        outfile = outfile or sys.stdout
+        for line in infile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Request must be a JSON object")
+            except ValueError as e:
+                response: dict[str, Any] = {"id": None, "error": f"Invalid request: {e}"}
+            else:
+                response = self.handle(request)
+            outfile.write(json.dumps(response, ensure_ascii=False) + "\n")
+            outfile.flush()
+            if not self.running:
+                break
+
+
 def main():
     """Main entry point."""
     import argparse
 
+    def non_negative_int(value: str) -> int:
+        number = int(value)
+        if number < 0:
+            raise argparse.ArgumentTypeError(f"must be 0 or more: {value}")
+        return number
+
+    def positive_int(value: str) -> int:
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"must be 1 or more: {value}")
+        return number
+
+    def tail_position(value: str) -> str:
+        setup_pythonpath()
+        from ccl_chromium_reader.storage_formats import ccl_leveldb  # type: ignore
+
+        try:
+            ccl_leveldb.TailPosition.from_string(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e)) from e
+        return value
+
     parser = argparse.ArgumentParser(description="Export Linear data from local IndexedDB cache")
     parser.add_argument(
         "--discover",
         action="store_true",
         help="Discover IndexedDB structure with field-level detail (does not export data)",
     )
+    parser.add_argument(
+        "--table-cache",
+        default=TABLE_CACHE_PATH,
+        metavar="PATH",
+        help="File caching decoded records per LevelDB table between exports (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-table-cache",
+        action="store_true",
+        help="Decode every table without reading or writing the table cache",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep the data in memory and answer JSON-lines requests on stdin/stdout (see ExportServer)",
+    )
+    parser.add_argument(
+        "--recent-issues",
+        type=non_negative_int,
+        default=RECENT_ISSUES_LIMIT,
+        metavar="K",
+        help="Recent active issue titles exported per project, 0 for none (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--group-issues-by",
+        metavar="FIELDS",
+        help=f"With --serve, the comma-separated issue fields indexed for queries "
+        f"(default: {','.join(ISSUE_GROUP_FIELDS)})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("json", "ndjson", "pretty"),
+        default="json",
+        help="json: compact JSON streamed entity by entity; ndjson: one entity per line; "
+        "pretty: the indented document built in memory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--issues",
+        action="store_true",
+        help="Include issues in the export (implied by the --issue-* filters)",
+    )
+    parser.add_argument("--issue-limit", type=int, metavar="N", help="Export at most N issues, newest first")
+    parser.add_argument("--issue-team", metavar="ID", help="Only export issues of this team")
+    parser.add_argument("--issue-project", metavar="ID", help="Only export issues of this project")
+    parser.add_argument(
+        "--issues-updated-since",
+        metavar="TIMESTAMP",
+        help="Only export issues whose updatedAt is at or after this ISO 8601 timestamp",
+    )
+    parser.add_argument(
+        "--since-seq",
+        type=int,
+        metavar="N",
+        help="Export only the entities changed since LevelDB sequence number N (the watermark.seq of an "
+        "earlier delta, or _meta.watermark.seq of a full export), as upserts and deletes with a new "
+        "watermark (see export_delta)",
+    )
+    parser.add_argument(
+        "--since-position",
+        type=tail_position,
+        metavar="POSITION",
+        help="With --since-seq, the position from the same watermark: only files written since are read",
+    )
+    parser.add_argument(
+        "--all-workspaces",
+        action="store_true",
+        help="Export (or with --discover, describe) every Linear workspace database, keyed by "
+        "organization, instead of the first one found",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        metavar="N",
+        help="Decompress and decode tables with N worker processes (default: %(default)s, no workers)",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help=f"Time each phase and count records, bytes and blobs: reported on stderr as JSON lines and in "
+        f"_meta.instrumentation (also enabled by setting {INSTRUMENT_ENV_VAR}=1)",
+    )
     args = parser.parse_args()
+    if args.all_workspaces and (args.serve or args.format == "ndjson"):
+        parser.error("--all-workspaces can't be combined with --serve or --format ndjson")
+    if args.since_seq is not None and (args.serve or args.all_workspaces or args.format == "ndjson"):
+        parser.error("--since-seq can't be combined with --serve, --all-workspaces or --format ndjson")
+    if args.since_position is not None and args.since_seq is None:
+        parser.error("--since-position needs --since-seq")
+    if args.group_issues_by is not None and not args.serve:
+        parser.error("--group-issues-by needs --serve (exports index the fields their issue filters use)")
+    instrument = args.instrument or instrumentation_enabled()
+    table_cache_path = None if args.no_table_cache else args.table_cache
+    group_by = ISSUE_GROUP_FIELDS
+    if args.group_issues_by is not None:
+        group_by = tuple(field.strip() for field in args.group_issues_by.split(",") if field.strip())
+
+    if args.serve:
+        sys.stdin.reconfigure(encoding="utf-8")
+        sys.stdout.reconfigure(encoding="utf-8")
+        ExportServer(table_cache_path, args.jobs, args.recent_issues, group_by, instrument).serve()
+        return
+
+    issue_query = None
+    if args.issues or any(
+        value is not None
+        for value in (args.issue_limit, args.issue_team, args.issue_project, args.issues_updated_since)
+    ):
+        issue_query = {
+            "limit": args.issue_limit,
+            "teamId": args.issue_team,
+            "projectId": args.issue_project,
+            "updatedSince": args.issues_updated_since,
+        }
 
     try:
         if args.discover:
-            result = discover_stores()
+            print(json.dumps(discover_stores(args.all_workspaces), ensure_ascii=False, indent=2))
+        elif args.since_seq is not None:
+            result = export_delta(
+                args.since_seq,
+                args.since_position,
+                issue_query,
+                make_instrumentation() if instrument else None,
+            )
+            print(json.dumps(result, ensure_ascii=False, indent=2 if args.format == "pretty" else None))
+        elif args.all_workspaces:
+            result = export_workspaces(
+                table_cache_path,
+                jobs=args.jobs,
+                recent_limit=args.recent_issues,
+                issue_query=issue_query,
+                instrumentation=make_instrumentation() if instrument else None,
+            )
+            if args.format == "pretty":
+                print(json.dumps(result, ensure_ascii=False, indent=2))
+            else:
+                print(json.dumps(result, ensure_ascii=False, separators=(",", ":")))
+        elif args.format == "pretty":
+            result = export_all(
+                table_cache_path,
+                jobs=args.jobs,
+                recent_limit=args.recent_issues,
+                issue_query=issue_query,
+                instrumentation=make_instrumentation() if instrument else None,
+            )
+            print(json.dumps(result, ensure_ascii=False, indent=2))
         else:
-            result = export_all()
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+            instrumentation = make_instrumentation() if instrument else None
+            watermark: dict[str, Any] = {}
+            data = load_linear_data(
+                table_cache_path, jobs=args.jobs, instrumentation=instrumentation, watermark=watermark
+            )
+            with _phase(instrumentation, "index"):
+                index = _export_index(data, args.recent_issues, issue_query)
+            write_export(sys.stdout, data, index, args.format, issue_query, instrumentation, watermark)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         import traceback
@@ -1,6 +1,12 @@
-import { describe, it, expect } from 'vitest';
+import { describe, it, expect, vi } from 'vitest';
 import type { LocalCacheData, LocalCacheProject } from '../services/linear-local-cache';
 
+vi.mock('electron', () => ({
+  app: { getAppPath: vi.fn(() => '/tmp'), isPackaged: false },
+}));
+
+import { splitJsonLines } from '../services/linear-local-cache';
+
 describe('Linear Local Cache - Types and Interfaces', () => {
   describe('LocalCacheProject interface', () => {
     it('should have required fields: id, name, teamId, recentIssueTitles', () => {
@@ -179,4 +185,28 @@ describe('Linear Local Cache - Types and Interfaces', () => {
       expect(deserialized.projects).toHaveLength(0);
     });
   });
+
+  describe('Worker output framing', () => {
+    it('should return complete lines and keep the partial remainder', () => {
+      const { lines, rest } = splitJsonLines('{"id":1,"result":null}\n{"id":2,');
+
+      expect(lines).toEqual(['{"id":1,"result":null}']);
+      expect(rest).toBe('{"id":2,');
+    });
+
+    it('should reassemble a response split across chunks', () => {
+      const first = splitJsonLines('{"id":3,"result":"po');
+      const second = splitJsonLines(first.rest + 'ng"}\n');
+
+      expect(first.lines).toHaveLength(0);
+      expect(second.lines).toEqual(['{"id":3,"result":"pong"}']);
+      expect(second.rest).toBe('');
+    });
+
+    it('should skip blank lines', () => {
+      const { lines } = splitJsonLines('\n{"id":4,"result":[]}\n\n');
+
+      expect(lines).toEqual(['{"id":4,"result":[]}']);
+    });
+  });
 });
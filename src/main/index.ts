@@ -15,6 +15,7 @@ import { initAutoUpdater, checkForUpdates } from '../services/auto-updater';
 import { createSlackService } from '../services/slack-client';
 import { createNotionService } from '../services/notion-client';
 import { closeNotionLocalReader } from '../services/notion-local-reader';
+import { closeLocalCacheWorker } from '../services/linear-local-cache';
 import { createGmailService } from '../services/gmail-client';
 import { trackAppOpen } from '../services/analytics';
 import { initDatabaseService, closeDatabaseService } from '../services/database';
@@ -164,6 +165,7 @@ app.on('will-quit', async () => {
   unregisterAllHotkeys();
   destroyTray();
   closeNotionLocalReader();
+  closeLocalCacheWorker();
   await closeDatabaseService();
 });
 
@@ -1,10 +1,10 @@
-import { execFile } from 'child_process';
-import { promisify } from 'util';
+import { spawn, ChildProcessWithoutNullStreams } from 'child_process';
 import * as path from 'path';
 import { app } from 'electron';
 import { logger } from './utils/logger';
 
-const execFileAsync = promisify(execFile);
+/** Per-request timeout; the first request of a worker includes the cold IndexedDB read. */
+const REQUEST_TIMEOUT_MS = 8000;
 
 /**
  * Project data from local Linear cache
@@ -25,41 +25,176 @@ export interface LocalCacheData {
   projects: LocalCacheProject[];
 }
 
+interface PendingRequest {
+  resolve: (result: unknown) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+/**
+ * Split buffered worker output into complete lines.
+ *
+ * @returns the complete lines and the trailing partial line to keep buffering
+ */
+export function splitJsonLines(buffer: string): { lines: string[]; rest: string } {
+  const parts = buffer.split('\n');
+  const rest = parts.pop() ?? '';
+  return { lines: parts.filter(line => line.trim() !== ''), rest };
+}
+
+/**
+ * Long-lived `export_linear_cache.py --serve` process.
+ *
+ * Keeps the decoded IndexedDB in memory between refreshes and answers JSON-lines requests,
+ * so only the first request pays for interpreter startup and the IndexedDB read.
+ * The process is respawned on the next request if it exits.
+ */
+class LocalCacheWorker {
+  private child: ChildProcessWithoutNullStreams | null = null;
+  private buffer = '';
+  private nextId = 1;
+  private pending = new Map<number, PendingRequest>();
+
+  constructor(private readonly scriptPath: string) {}
+
+  request<T>(method: string, params: Record<string, unknown> = {}): Promise<T> {
+    const child = this.ensureStarted();
+    const id = this.nextId++;
+
+    return new Promise<T>((resolve, reject) => {
+      const timer = setTimeout(() => {
+        // Leave the worker running: a slow cold read still warms it for the next refresh
+        this.pending.delete(id);
+        const error = new Error(`Request "${method}" timed out`) as NodeJS.ErrnoException;
+        error.code = 'ETIMEDOUT';
+        reject(error);
+      }, REQUEST_TIMEOUT_MS);
+
+      this.pending.set(id, { resolve: resolve as (result: unknown) => void, reject, timer });
+      child.stdin.write(JSON.stringify({ id, method, params }) + '\n');
+    });
+  }
+
+  stop(): void {
+    if (this.child) {
+      this.child.stdin.end();
+      this.child = null;
+    }
+    this.failAll(new Error('Local cache worker stopped'));
+  }
+
+  private ensureStarted(): ChildProcessWithoutNullStreams {
+    if (this.child) {
+      return this.child;
+    }
+
+    logger.log('[LocalCache] Starting worker:', this.scriptPath);
+    const child = spawn('python3', [this.scriptPath, '--serve']);
+    this.child = child;
+    this.buffer = '';
+
+    child.stdout.setEncoding('utf8');
+    child.stdout.on('data', (chunk: string) => {
+      const { lines, rest } = splitJsonLines(this.buffer + chunk);
+      this.buffer = rest;
+      for (const line of lines) {
+        this.handleLine(line);
+      }
+    });
+
+    child.stderr.setEncoding('utf8');
+    child.stderr.on('data', (chunk: string) => {
+      logger.warn('[LocalCache] Python stderr:', chunk);
+    });
+
+    child.on('error', (error) => {
+      if (this.child === child) {
+        this.child = null;
+      }
+      this.failAll(error);
+    });
+
+    child.on('exit', (code) => {
+      if (this.child === child) {
+        this.child = null;
+      }
+      this.failAll(new Error(`Local cache worker exited with code ${code}`));
+    });
+
+    // Writes after the worker died surface through the 'error'/'exit' handlers
+    child.stdin.on('error', () => undefined);
+
+    return child;
+  }
+
+  private handleLine(line: string): void {
+    let response: { id: number | null; result?: unknown; error?: string };
+    try {
+      response = JSON.parse(line);
+    } catch {
+      logger.warn('[LocalCache] Unparseable worker output:', line.slice(0, 200));
+      return;
+    }
+
+    const pending = response.id !== null ? this.pending.get(response.id) : undefined;
+    if (!pending) {
+      return; // timed out earlier
+    }
+    this.pending.delete(response.id as number);
+    clearTimeout(pending.timer);
+
+    if (response.error !== undefined) {
+      pending.reject(new Error(response.error));
+    } else {
+      pending.resolve(response.result);
+    }
+  }
+
+  private failAll(error: Error): void {
+    for (const pending of this.pending.values()) {
+      clearTimeout(pending.timer);
+      pending.reject(error);
+    }
+    this.pending.clear();
+  }
+}
+
+let workerInstance: LocalCacheWorker | null = null;
+
+function getLocalCacheWorker(): LocalCacheWorker {
+  if (!workerInstance) {
+    // Get script path (handle both development and packaged app)
+    let appPath = app.getAppPath();
+    if (appPath.includes('app.asar')) {
+      appPath = appPath.replace('app.asar', 'app.asar.unpacked');
+    }
+    workerInstance = new LocalCacheWorker(path.join(appPath, 'scripts', 'export_linear_cache.py'));
+  }
+  return workerInstance;
+}
+
+export function closeLocalCacheWorker(): void {
+  if (workerInstance) {
+    workerInstance.stop();
+    workerInstance = null;
+  }
+}
+
 /**
  * Load Linear project data from local IndexedDB cache.
  * 
- * Spawns Python script to read Linear Desktop App's IndexedDB and parse JSON output.
- * Returns null on any error (Python not installed, script failure, timeout, parse error).
+ * Asks the long-lived Python worker (export_linear_cache.py --serve) for an export of
+ * Linear Desktop App's IndexedDB; the worker only re-reads the database when it has changed.
+ * Returns null on any error (Python not installed, script failure, timeout, invalid data).
  * 
  * @returns LocalCacheData if successful, null otherwise
  */
 export async function loadLocalCache(): Promise<LocalCacheData | null> {
   try {
-    // Get script path (handle both development and packaged app)
-     let appPath = app.getAppPath();
-     if (appPath.includes('app.asar')) {
-       appPath = appPath.replace('app.asar', 'app.asar.unpacked');
-     }
-     const scriptPath = path.join(appPath, 'scripts', 'export_linear_cache.py');
-
-     logger.log('[LocalCache] Loading cache from:', scriptPath);
-
-    // Execute Python script with 8 second timeout
-    const { stdout, stderr } = await execFileAsync('python3', [scriptPath], {
-      timeout: 8000,
-      maxBuffer: 10 * 1024 * 1024, // 10MB buffer for large cache
-    });
-
-     // Log stderr if present (warnings/errors)
-     if (stderr) {
-       logger.warn('[LocalCache] Python stderr:', stderr);
-     }
-
-     // Parse JSON output
-     const data = JSON.parse(stdout) as LocalCacheData;
+    const data = await getLocalCacheWorker().request<LocalCacheData>('export');
 
      // Validate structure
-     if (!data.version || !data.updatedAt || !Array.isArray(data.projects)) {
+     if (!data || !data.version || !data.updatedAt || !Array.isArray(data.projects)) {
        logger.error('[LocalCache] Invalid data structure:', data);
        return null;
      }